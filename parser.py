@@ -1,39 +1,100 @@
-import requests
 import re
+import re2
 import os
+import sys
+import atexit
 import asyncio
-import time
-import json
+import orjson
+from collections import defaultdict
+import aiohttp
+import httpx
+import numpy as np
+from aiolimiter import AsyncLimiter
 from typing import List, Dict
-from bs4 import BeautifulSoup
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup, NavigableString
 from telethon import TelegramClient
 from telethon.errors import FloodWaitError, ChannelPrivateError
 
+# Максимальное количество постов в одном запросе wall.getById
+_VK_MAX_POSTS_PER_REQUEST = 100
+# Максимальное количество вызовов API внутри одного запроса execute
+_VK_MAX_EXECUTE_CALLS = 25
+
+# Максимальный размер файла со ссылками, читаемый за один вызов
+_LINKS_FILE_MAX_BYTES = 1 << 20
+
+# Соответствие домена ссылки платформе (поддомены определяются по суффиксу)
+_HOST_PLATFORMS = {
+    'vk.com': 'vk',
+    't.me': 'telegram',
+    'telegram.me': 'telegram',
+    'ok.ru': 'ok'
+}
+
+# Шаблоны ссылок компилируются один раз при загрузке модуля
+# Ссылка «wall-owner_post» в любом месте строки имеет приоритет над «vk.com/owner_post»,
+# поэтому обе ветви привязаны к началу строки
+_VK_POST_RE = re.compile(
+    r'^(?:.*?wall-?(?P<owner_id>\d+)_(?P<post_id>\d+)'
+    r'|.*?vk\.com/(?P<post>\d+_\d+))'
+)
+
+_TG_PATTERNS = [re.compile(p) for p in (
+    r'(?:t\.me|telegram\.me)/(?:s/)?([^/\?]+)/(\d+)',
+    r'(?:t\.me|telegram\.me)/c/(\d+)/(\d+)'
+)]
+
+_OK_PATTERNS = [re.compile(p) for p in (
+    r'ok\.ru/([^/\?]+)/topic/(\d+)',
+    r'ok\.ru/([^/\?]+)/status/(\d+)',
+    r'ok\.ru/(?:group)?(\d+)/topic/(\d+)'
+)]
+
+# Селекторы и шаблоны для поиска просмотров в HTML OK.ru (RE2 без бэктрекинга)
+_OK_VIEW_CLASS_RE = re2.compile(r'(?i)view|count|visitors')
+_OK_VIEW_ATTR_PATTERNS = (
+    ('class', _OK_VIEW_CLASS_RE),
+    ('data-l', re2.compile(r'(?i)view')),
+    ('data-module', re2.compile(r'(?i)like')),
+)
+# В RE2 \s совпадает только с ASCII-пробелами, поэтому неразрывный пробел указан явно
+_OK_VIEW_TEXT_RE = re2.compile(r'(?i)\d+[\s\x{00A0}]*(?:просмотр|лайк|участник)')
+_NUM_RE = re2.compile(r'\d+')
+
 class ConfigManager:
     """Менеджер конфигурации для хранения данных"""
     
     def __init__(self):
         self.config_file = "config.json"
         self.config = {}
+        self._dirty = False
         self.load_config()
+        atexit.register(self.save_if_dirty)
     
     def load_config(self):
         """Загружает конфигурацию из файла"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    self.config = orjson.loads(f.read())
             except:
                 self.config = {}
     
     def save_config(self):
         """Сохраняет конфигурацию в файл"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, ensure_ascii=False, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
         except Exception as e:
             print(f"Ошибка сохранения конфигурации: {e}")
     
+    def save_if_dirty(self):
+        """Сохраняет конфигурацию, если в ней есть несохраненные изменения"""
+        if self._dirty:
+            self.save_config()
+            self._dirty = False
+    
     def get(self, key, default=None):
         """Получает значение из конфигурации"""
         return self.config.get(key, default)
@@ -41,7 +102,7 @@ class ConfigManager:
     def set(self, key, value):
         """Устанавливает значение в конфигурации"""
         self.config[key] = value
-        self.save_config()
+        self._dirty = True
     
     def has_telegram_creds(self):
         """Проверяет наличие Telegram данных"""
@@ -60,16 +121,23 @@ class SocialMediaParser:
     
     def __init__(self, config: ConfigManager):
         self.config = config
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
     
     def read_links_from_file(self, filename: str = "links.txt") -> List[str]:
         """Читает ссылки из текстового файла"""
         try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                links = [line.strip() for line in file if line.strip()]
+            # Файл читается одним системным вызовом, без буферизованного потока
+            fd = os.open(filename, os.O_RDONLY)
+            try:
+                data = os.read(fd, _LINKS_FILE_MAX_BYTES)
+            finally:
+                os.close(fd)
+            
+            # Если файл не поместился целиком, отбрасываем оборванную последнюю строку,
+            # чтобы не разрезать ссылку и многобайтовый символ UTF-8
+            if len(data) == _LINKS_FILE_MAX_BYTES and b'\n' in data:
+                data = data[:data.rindex(b'\n')]
+            
+            links = [line.strip() for line in data.decode('utf-8').splitlines() if line.strip()]
             
             if not links:
                 print(f"Файл '{filename}' пуст!")
@@ -94,71 +162,85 @@ class SocialMediaParser:
         """
         Извлекает идентификаторы постов из ссылок разных соцсетей
         """
-        vk_posts = []
-        telegram_posts = []
-        ok_posts = []
+        posts = {
+            'vk': [],
+            'telegram': [],
+            'ok': []
+        }
+        extractors = {
+            'vk': self._extract_vk_post,
+            'telegram': self._extract_telegram_post,
+            'ok': self._extract_ok_post
+        }
+        
+        seen = set()
         
         for link in links:
-            link_lower = link.lower()
+            # Повторные ссылки не порождают лишних запросов к API
+            if link in seen:
+                print(f"Повторная ссылка пропущена: {link}")
+                continue
+            seen.add(link)
             
-            # VK посты
-            if 'vk.com' in link_lower or link_lower.startswith('wall'):
-                self._extract_vk_post(link_lower, link, vk_posts)
+            link_lower = link.lower()
             
-            # Telegram посты
-            elif 't.me' in link_lower or 'telegram.me' in link_lower:
-                self._extract_telegram_post(link_lower, link, telegram_posts)
+            # Короткая запись VK поста без домена (wall-1_2)
+            if link_lower.startswith('wall'):
+                self._extract_vk_post(link_lower, link, posts['vk'])
+                continue
             
-            # Одноклассники (OK.ru)
-            elif 'ok.ru' in link_lower:
-                self._extract_ok_post(link_lower, link, ok_posts)
+            # Ссылки без схемы (vk.com/...) повторно разбираются как «//vk.com/...»
+            try:
+                parsed = urlparse(link_lower)
+                if not parsed.netloc:
+                    parsed = urlparse(f"//{link_lower}")
+                host = parsed.hostname
+            except ValueError:
+                host = None
+            platform = self._platform_for_host(host) if host else None
             
+            if platform:
+                extractors[platform](link_lower, link, posts[platform])
             else:
                 print(f"Неизвестный формат ссылки: {link}")
         
-        return {
-            'vk': vk_posts,
-            'telegram': telegram_posts,
-            'ok': ok_posts
-        }
+        return posts
+    
+    def _platform_for_host(self, host: str):
+        """Определяет платформу по домену ссылки, включая поддомены (www., m., new.)"""
+        platform = _HOST_PLATFORMS.get(host)
+        if platform:
+            return platform
+        
+        for domain, platform in _HOST_PLATFORMS.items():
+            if host.endswith(f".{domain}"):
+                return platform
+        return None
     
     def _extract_vk_post(self, link: str, original_link: str, vk_posts: List[Dict]):
         """Извлекает данные VK поста"""
-        patterns = [
-            r'wall-?(\d+)_(\d+)',
-            r'vk\.com/(?:wall)?(\d+_\d+)',
-            r'vk\.com/(?:[\w\.]+)\?w=wall-(\d+_\d+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, link)
-            if match:
-                if pattern == patterns[0]:  # wall-owner_id_post_id
-                    owner_id = match.group(1)
-                    post_id = match.group(2)
-                    if not owner_id.startswith('-'):
-                        owner_id = f"-{owner_id}"
-                    post_id_str = f"{owner_id}_{post_id}"
-                else:
-                    post_id_str = match.group(1)
-                
-                vk_posts.append({
-                    'post_id': post_id_str,
-                    'original_link': original_link
-                })
-                return
+        match = _VK_POST_RE.search(link)
+        if match:
+            if match.group('owner_id'):  # wall-owner_id_post_id
+                owner_id = match.group('owner_id')
+                post_id = match.group('post_id')
+                if not owner_id.startswith('-'):
+                    owner_id = f"-{owner_id}"
+                post_id_str = f"{owner_id}_{post_id}"
+            else:
+                post_id_str = match.group('post')
+            
+            vk_posts.append({
+                'post_id': post_id_str,
+                'original_link': original_link
+            })
     
     def _extract_telegram_post(self, link: str, original_link: str, telegram_posts: List[Dict]):
         """Извлекает данные Telegram поста"""
         clean_link = link.split('?')[0].split('#')[0]
         
-        patterns = [
-            r'(?:t\.me|telegram\.me)/(?:s/)?([^/\?]+)/(\d+)',
-            r'(?:t\.me|telegram\.me)/c/(\d+)/(\d+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, clean_link)
+        for pattern in _TG_PATTERNS:
+            match = pattern.search(clean_link)
             if match:
                 channel = match.group(1)
                 message_id = int(match.group(2))
@@ -177,14 +259,8 @@ class SocialMediaParser:
     
     def _extract_ok_post(self, link: str, original_link: str, ok_posts: List[Dict]):
         """Извлекает данные OK.ru поста"""
-        patterns = [
-            r'ok\.ru/([^/\?]+)/topic/(\d+)',
-            r'ok\.ru/([^/\?]+)/status/(\d+)',
-            r'ok\.ru/(?:group)?(\d+)/topic/(\d+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, link)
+        for pattern in _OK_PATTERNS:
+            match = pattern.search(link)
             if match:
                 group_name = match.group(1)
                 topic_id = match.group(2)
@@ -204,10 +280,9 @@ class VKParser:
     def __init__(self, config: ConfigManager):
         self.config = config
         self.api_token = None
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
     
     def setup_token(self):
         """Запрашивает токен VK у пользователя"""
@@ -221,77 +296,116 @@ class VKParser:
         token = input("Введите ваш VK API токен: ").strip()
         if token:
             self.config.set('vk_token', token)
+            self.config.save_if_dirty()
             self.api_token = token
             print("✓ Токен сохранен")
         else:
             print("✗ Токен не был введен")
     
-    def get_views(self, vk_posts: List[Dict]) -> tuple[int, List[Dict]]:
-        """Получает просмотры для постов VK через API"""
-        if not vk_posts:
-            return 0, []
-        
+    async def _request_posts(self, client: httpx.AsyncClient, chunks: List[List[str]]) -> Dict:
+        """Выполняет несколько вызовов wall.getById одним запросом execute к VK API"""
+        calls = ','.join(
+            f"API.wall.getById({orjson.dumps({'posts': ','.join(chunk), 'extended': 0}).decode()})"
+            for chunk in chunks
+        )
+        response = await client.post(
+            'https://api.vk.com/method/execute',
+            data={
+                'access_token': self.api_token,
+                'v': '5.199',
+                'code': f"return [{calls}];"
+            }
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def prepare(self) -> bool:
+        """Загружает токен VK из конфигурации или запрашивает его у пользователя"""
         # Если токена нет, запрашиваем его
         if not self.config.has_vk_token():
-            self.api_token = self.config.get('vk_token')
-            if not self.api_token:
-                self.setup_token()
-                self.api_token = self.config.get('vk_token')
+            self.setup_token()
         
-        if not self.api_token:
+        if not self.config.has_vk_token():
             print("Внимание: VK API токен не установлен. VK посты не будут обработаны.")
+            return False
+        
+        self.api_token = self.config.get('vk_token')
+        return True
+    
+    async def get_views_async(self, vk_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Асинхронное получение просмотров для постов VK через API"""
+        if not vk_posts:
+            return 0, []
+        
+        if not self.prepare():
             return 0, []
         
-        total_views = 0
         vk_views_data = []
         
         print(f"\nПолучаю просмотры для {len(vk_posts)} VK постов...")
         
         try:
             post_ids = [post['post_id'] for post in vk_posts]
+            # wall.getById принимает не более 100 постов за один вызов,
+            # а execute объединяет до 25 таких вызовов в один запрос
+            chunks = [
+                post_ids[i:i + _VK_MAX_POSTS_PER_REQUEST]
+                for i in range(0, len(post_ids), _VK_MAX_POSTS_PER_REQUEST)
+            ]
+            batches = [
+                chunks[i:i + _VK_MAX_EXECUTE_CALLS]
+                for i in range(0, len(chunks), _VK_MAX_EXECUTE_CALLS)
+            ]
             
-            response = self.session.post(
-                'https://api.vk.com/method/wall.getById',
-                params={
-                    'access_token': self.api_token,
-                    'v': '5.199',
-                    'posts': ','.join(post_ids),
-                    'extended': 0
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            if 'error' in data:
-                print(f"Ошибка VK API: {data['error']['error_msg']}")
-                return 0, []
+            async with httpx.AsyncClient(http2=True, headers=self.headers, timeout=10.0) as client:
+                responses = await asyncio.gather(
+                    *[self._request_posts(client, batch) for batch in batches]
+                )
             
-            posts = data.get('response', {}).get('items', [])
             post_views = {}
             
-            for post in posts:
-                post_key = f"{post.get('owner_id', 0)}_{post.get('id', 0)}"
-                views = post.get('views', {}).get('count', 0)
-                post_views[post_key] = views
+            for data in responses:
+                if 'error' in data:
+                    print(f"Ошибка VK API: {data['error']['error_msg']}")
+                    return 0, []
+                
+                for error in data.get('execute_errors', []):
+                    print(f"Ошибка VK API: {error.get('error_msg')}")
+                
+                # Неудачный вызов внутри execute возвращает false вместо результата
+                for result in data.get('response') or []:
+                    if not result:
+                        continue
+                    
+                    for post in result.get('items', []):
+                        post_key = f"{post.get('owner_id', 0)}_{post.get('id', 0)}"
+                        views = post.get('views', {}).get('count', 0)
+                        post_views[post_key] = views
+            
+            log_lines = []
             
             for i, vk_post in enumerate(vk_posts, 1):
                 post_id = vk_post['post_id']
                 views = post_views.get(post_id, 0)
-                total_views += views
-                
-                print(f"  [{i}/{len(vk_posts)}] VK: {vk_post['original_link']}: {views:,}")
+                log_lines.append(f"  [{i}/{len(vk_posts)}] VK: {vk_post['original_link']}: {views:,}")
                 
                 vk_views_data.append({
                     'link': vk_post['original_link'],
                     'views': views
                 })
             
-            return total_views, vk_views_data
+            # Вывод одной записью вместо print на каждый пост
+            sys.stdout.write('\n'.join(log_lines) + '\n')
+            
+            return sum(item['views'] for item in vk_views_data), vk_views_data
             
         except Exception as e:
             print(f"Ошибка при получении данных VK: {e}")
             return 0, []
+    
+    def get_views(self, vk_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Синхронная обертка для асинхронной функции"""
+        return asyncio.run(self.get_views_async(vk_posts))
 
 class TelegramParser:
     """Парсер для получения просмотров из Telegram"""
@@ -302,6 +416,7 @@ class TelegramParser:
         self.api_hash = None
         self.phone = None
         self.session_name = "session"
+        self.client = None
     
     def setup_credentials(self):
         """Запрашивает данные Telegram API у пользователя"""
@@ -323,6 +438,7 @@ class TelegramParser:
                 self.config.set('telegram_api_id', api_id)
                 self.config.set('telegram_api_hash', api_hash)
                 self.config.set('telegram_phone', phone)
+                self.config.save_if_dirty()
                 
                 self.api_id = api_id
                 self.api_hash = api_hash
@@ -335,164 +451,234 @@ class TelegramParser:
             print("✗ Все поля обязательны для заполнения")
     
     async def _connect(self):
-        """Подключается к Telegram API"""
+        """Подключается к Telegram API, переиспользуя уже открытое соединение"""
+        if self.client is not None and self.client.is_connected():
+            return True
+        
         try:
-            self.client = TelegramClient(self.session_name, self.api_id, self.api_hash)
+            if self.client is None:
+                self.client = TelegramClient(self.session_name, self.api_id, self.api_hash)
             await self.client.start(phone=self.phone)
             return True
         except Exception as e:
             print(f"Ошибка подключения к Telegram: {e}")
             return False
     
-    async def get_views_async(self, telegram_posts: List[Dict]) -> tuple[int, List[Dict]]:
-        """Асинхронное получение просмотров для Telegram постов"""
-        if not telegram_posts:
-            return 0, []
-        
+    async def prepare(self) -> bool:
+        """Загружает или запрашивает данные Telegram API и подключается к Telegram"""
         # Если данных нет, запрашиваем их
         if not self.config.has_telegram_creds():
-            self.api_id = self.config.get('telegram_api_id')
-            self.api_hash = self.config.get('telegram_api_hash')
-            self.phone = self.config.get('telegram_phone')
-            
-            if not all([self.api_id, self.api_hash, self.phone]):
-                self.setup_credentials()
-                self.api_id = self.config.get('telegram_api_id')
-                self.api_hash = self.config.get('telegram_api_hash')
-                self.phone = self.config.get('telegram_phone')
+            self.setup_credentials()
         
-        if not all([self.api_id, self.api_hash, self.phone]):
+        if not self.config.has_telegram_creds():
             print("Внимание: Данные Telegram API не установлены. Telegram посты не будут обработаны.")
-            return 0, []
+            return False
+        
+        self.api_id = self.config.get('telegram_api_id')
+        self.api_hash = self.config.get('telegram_api_hash')
+        self.phone = self.config.get('telegram_phone')
         
         if not await self._connect():
             print("Не удалось подключиться к Telegram")
+            return False
+        return True
+    
+    async def get_views_async(self, telegram_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Асинхронное получение просмотров для Telegram постов"""
+        if not telegram_posts:
             return 0, []
         
-        total_views = 0
-        telegram_views_data = []
+        if not await self.prepare():
+            return 0, []
+        
+        telegram_views_data = [None] * len(telegram_posts)
         
         print(f"\nПолучаю просмотры для {len(telegram_posts)} Telegram постов...")
         
-        for i, post_info in enumerate(telegram_posts, 1):
-            try:
-                message = await self.client.get_messages(
-                    post_info['channel'], 
-                    ids=post_info['message_id']
-                )
-                
+        # Группируем посты по каналам, чтобы запрашивать сообщения одним вызовом
+        by_channel = defaultdict(list)
+        for index, post_info in enumerate(telegram_posts):
+            by_channel[post_info['channel']].append(
+                (post_info['message_id'], post_info['original_link'], index)
+            )
+        
+        log_lines = []
+        
+        for group_index, (channel, channel_posts) in enumerate(by_channel.items()):
+            error = None
+            
+            while True:
+                try:
+                    messages = await self.client.get_messages(
+                        channel,
+                        ids=[message_id for message_id, _, _ in channel_posts]
+                    )
+                    break
+                except FloodWaitError as e:
+                    print(f"  Telegram: {channel}: лимит запросов. Ожидание {e.seconds} секунд...")
+                    await asyncio.sleep(e.seconds)
+                except (ChannelPrivateError, Exception) as e:
+                    error = type(e).__name__
+                    messages = [None] * len(channel_posts)
+                    break
+            
+            for (_, original_link, index), message in zip(channel_posts, messages):
                 views = getattr(message, 'views', 0) or 0
-                total_views += views
-                
-                print(f"  [{i}/{len(telegram_posts)}] Telegram: {post_info['original_link']}: {views:,}")
+                if error:
+                    log_lines.append(f"  [{index + 1}/{len(telegram_posts)}] Telegram: {original_link}: ошибка - {error}")
+                else:
+                    log_lines.append(f"  [{index + 1}/{len(telegram_posts)}] Telegram: {original_link}: {views:,}")
                 
-                telegram_views_data.append({
-                    'link': post_info['original_link'],
+                telegram_views_data[index] = {
+                    'link': original_link,
                     'views': views
-                })
-                
-            except FloodWaitError as e:
-                print(f"  [{i}/{len(telegram_posts)}] Лимит запросов. Ожидание {e.seconds} секунд...")
-                await asyncio.sleep(e.seconds)
-            except (ChannelPrivateError, Exception) as e:
-                print(f"  [{i}/{len(telegram_posts)}] Telegram: {post_info['original_link']}: ошибка - {type(e).__name__}")
-                telegram_views_data.append({
-                    'link': post_info['original_link'],
-                    'views': 0
-                })
+                }
             
-            await asyncio.sleep(0.5)
+            # Пауза нужна только между запросами к разным каналам
+            if group_index < len(by_channel) - 1:
+                await asyncio.sleep(0.5)
+        
+        # Вывод одной записью вместо print на каждый пост
+        sys.stdout.write('\n'.join(log_lines) + '\n')
         
-        await self.client.disconnect()
-        return total_views, telegram_views_data
+        return sum(item['views'] for item in telegram_views_data), telegram_views_data
+    
+    async def close(self):
+        """Закрывает соединение с Telegram API"""
+        if self.client is not None:
+            await self.client.disconnect()
+            self.client = None
+    
+    async def _get_views_and_close(self, telegram_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Получает просмотры и закрывает соединение в том же цикле событий"""
+        try:
+            return await self.get_views_async(telegram_posts)
+        finally:
+            await self.close()
     
     def get_views(self, telegram_posts: List[Dict]) -> tuple[int, List[Dict]]:
         """Синхронная обертка для асинхронной функции"""
-        return asyncio.run(self.get_views_async(telegram_posts))
+        return asyncio.run(self._get_views_and_close(telegram_posts))
 
 class OKParser:
     """Парсер для получения просмотров из Одноклассников"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
+    def __init__(self, rate: float = 5, max_concurrency: int = 10):
+        self.rate = rate
+        self.max_concurrency = max_concurrency
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        }
     
-    def get_views(self, ok_posts: List[Dict]) -> tuple[int, List[Dict]]:
-        """Получает просмотры для постов OK.ru через парсинг HTML"""
+    async def get_views_async(self, ok_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Асинхронное получение просмотров для постов OK.ru через парсинг HTML"""
         if not ok_posts:
             return 0, []
         
-        total_views = 0
-        ok_views_data = []
-        
         print(f"\nПолучаю просмотры для {len(ok_posts)} OK.ru постов...")
         
-        for i, ok_post in enumerate(ok_posts, 1):
-            url = ok_post['original_link']
-            views = 0
+        ok_views_data = await self._gather(ok_posts)
+        total_views = sum(item['views'] for item in ok_views_data)
+        
+        return total_views, ok_views_data
+    
+    def get_views(self, ok_posts: List[Dict]) -> tuple[int, List[Dict]]:
+        """Синхронная обертка для асинхронной функции"""
+        return asyncio.run(self.get_views_async(ok_posts))
+    
+    async def _gather(self, ok_posts: List[Dict]) -> List[Dict]:
+        """Параллельно загружает страницы постов OK.ru"""
+        sem = asyncio.Semaphore(self.max_concurrency)
+        # Не более self.rate запросов в секунду для избежания блокировки;
+        # дробная частота (rate < 1) задается как один запрос за 1 / rate секунд,
+        # так как AsyncLimiter не выдает запрос при емкости меньше единицы
+        if self.rate >= 1:
+            limiter = AsyncLimiter(self.rate, 1.0)
+        else:
+            limiter = AsyncLimiter(1, 1 / self.rate)
+        
+        # Пул соединений по размеру семафора: соединения с ok.ru переиспользуются
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=30)
+        
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            return await asyncio.gather(*[
+                self._get_one(session, sem, limiter, ok_post, i, len(ok_posts))
+                for i, ok_post in enumerate(ok_posts, 1)
+            ])
+    
+    async def _get_one(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                       limiter: AsyncLimiter, ok_post: Dict, i: int, total: int) -> Dict:
+        """Получает просмотры для одного поста OK.ru"""
+        url = ok_post['original_link']
+        views = 0
+        
+        try:
+            async with limiter, sem, session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                status = response.status
+                html = await response.read() if status == 200 else None
             
-            try:
-                print(f"  [{i}/{len(ok_posts)}] Парсинг OK.ru: {url}")
-                response = self.session.get(url, timeout=15)
-                
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    views = self._extract_views_from_html(soup)
-                    print(f"     Найдено: {views:,} просмотров")
-                else:
-                    print(f"     Ошибка HTTP: {response.status_code}")
+            # Разбор HTML выполняется после освобождения слота семафора и соединения
+            if html is not None:
+                views = await asyncio.to_thread(self._extract_views_from_html, html)
+                print(f"  [{i}/{total}] OK.ru: {url}: {views:,}")
+            else:
+                print(f"  [{i}/{total}] OK.ru: {url}: ошибка HTTP {status}")
                     
-            except Exception as e:
-                print(f"     Ошибка: {e}")
-            
-            total_views += views
-            ok_views_data.append({
-                'link': url,
-                'views': views
-            })
-            
-            time.sleep(2)  # Задержка для избежания блокировки
+        except Exception as e:
+            print(f"  [{i}/{total}] OK.ru: {url}: ошибка - {e}")
         
-        return total_views, ok_views_data
+        return {
+            'link': url,
+            'views': views
+        }
     
-    def _extract_views_from_html(self, soup: BeautifulSoup) -> int:
+    def _extract_views_from_html(self, html: bytes) -> int:
         """Извлекает количество просмотров из HTML"""
-        view_selectors = [
-            {'class_': re.compile(r'view', re.I)},
-            {'class_': re.compile(r'count', re.I)},
-            {'class_': re.compile(r'visitors', re.I)},
-            {'data-l': re.compile(r'.*view.*', re.I)},
-            {'data-module': re.compile(r'.*like.*', re.I)},
-        ]
-        
-        all_numbers = []
-        
-        # Поиск в элементах с классами
-        for selector in view_selectors:
-            elements = soup.find_all(**selector)
-            for elem in elements:
-                text = elem.get_text()
-                numbers = re.findall(r'\d+', text.replace(' ', '').replace(',', ''))
-                all_numbers.extend([int(n) for n in numbers if 10 < int(n) < 1000000])
-        
-        # Поиск в строкой с текстом про просмотры
-        text_elements = soup.find_all(string=re.compile(r'\d+\s*(?:просмотр|лайк|участник)', re.I))
-        for text in text_elements:
-            numbers = re.findall(r'\d+', text)
-            all_numbers.extend([int(n) for n in numbers if 10 < int(n) < 1000000])
-        
-        # Поиск в мета-тегах
-        for meta in soup.find_all('meta'):
-            content = meta.get('content', '')
-            if 'просмотр' in content.lower():
-                numbers = re.findall(r'\d+', content)
-                all_numbers.extend([int(n) for n in numbers if 10 < int(n) < 1000000])
-        
-        return max(all_numbers) if all_numbers else 0
+        soup = BeautifulSoup(html, 'lxml')
+        candidates = []
+        
+        # Один проход по дереву вместо отдельных find_all для каждого признака
+        for node in soup.descendants:
+            # Строки с текстом про просмотры
+            if isinstance(node, NavigableString):
+                if _OK_VIEW_TEXT_RE.search(node):
+                    candidates.append(node.strip())
+                continue
+            
+            # Мета-теги
+            if node.name == 'meta':
+                content = node.get('content', '')
+                if 'просмотр' in content.lower():
+                    candidates.append(content)
+                continue
+            
+            # Элементы с классами и data-атрибутами
+            if self._has_view_attr(node):
+                candidates.append(node.get_text())
+        
+        # Числа ищутся одним проходом регулярного выражения по всему тексту
+        buf = '\n'.join(candidates).replace(' ', '').replace(',', '')
+        # Длина строки отсекает заведомо лишние числа до преобразования в int:
+        # значения из диапазона (10, 1000000) содержат от 2 до 6 цифр
+        all_numbers = np.fromiter(
+            (int(s) for s in _NUM_RE.findall(buf) if 2 <= len(s) <= 6),
+            dtype=np.int64
+        )
+        all_numbers = all_numbers[all_numbers > 10]
+        
+        return int(all_numbers.max()) if all_numbers.size else 0
+    
+    def _has_view_attr(self, tag) -> bool:
+        """Проверяет, указывают ли атрибуты тега на счетчик просмотров"""
+        for attr, pattern in _OK_VIEW_ATTR_PATTERNS:
+            value = tag.get(attr)
+            if isinstance(value, list):
+                value = ' '.join(value)
+            if value and pattern.search(value):
+                return True
+        return False
 
-def main():
+async def main():
     """Основная функция программы"""
     print("="*50)
     print("ПАРСЕР ПРОСМОТРОВ ДЛЯ VK, TELEGRAM И OK.RU")
@@ -526,23 +712,23 @@ def main():
     print(f"  Telegram: {len(telegram_posts)} постов")
     print(f"  OK.ru: {len(ok_posts)} постов")
     
-    # Сбор данных о просмотрах
-    total_views = 0
-    
-    # VK (только если есть VK посты)
-    if vk_posts:
-        vk_views, _ = vk_parser.get_views(vk_posts)
-        total_views += vk_views
-    
-    # Telegram (только если есть Telegram посты)
-    if telegram_posts:
-        tg_views, _ = telegram_parser.get_views(telegram_posts)
-        total_views += tg_views
-    
-    # OK.ru (только если есть OK.ru посты)
-    if ok_posts:
-        ok_views, _ = ok_parser.get_views(ok_posts)
-        total_views += ok_views
+    try:
+        # Ввод токенов и кода входа в Telegram блокирует цикл событий,
+        # поэтому он выполняется до параллельной загрузки данных
+        if vk_posts and not vk_parser.prepare():
+            vk_posts = []
+        if telegram_posts and not await telegram_parser.prepare():
+            telegram_posts = []
+        
+        # Сбор данных о просмотрах со всех платформ одновременно
+        (vk_views, _), (tg_views, _), (ok_views, _) = await asyncio.gather(
+            vk_parser.get_views_async(vk_posts),
+            telegram_parser.get_views_async(telegram_posts),
+            ok_parser.get_views_async(ok_posts)
+        )
+    finally:
+        await telegram_parser.close()
+    total_views = vk_views + tg_views + ok_views
     
     # Вывод результата
     print("\n" + "="*50)
@@ -557,4 +743,4 @@ def main():
         print("Не удалось получить данные по просмотрам")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file